@@ -0,0 +1,55 @@
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.http import parse_accept_header, parse_etags, quote_etag
+from app import create_app
+from controllers.meta_controller import HEALTH_BYTES, STATIC_PAYLOADS, select_variant
+
+# ASGI entry point for running the gateway under uvicorn:
+#   uvicorn asgi:app --workers 4 --loop uvloop --http httptools
+# Flask views still run synchronously, on asgiref's thread pool.
+flask_app = WsgiToAsgi(create_app())
+
+_HEALTH_HEADERS = [
+    (b'content-type', b'application/json'),
+    (b'content-length', str(len(HEALTH_BYTES)).encode()),
+    (b'cache-control', b'no-store')
+]
+
+def _static(path, headers):
+    """Build (status, headers, body) for a precomputed path, or None"""
+    if path == '/health':
+        return 200, _HEALTH_HEADERS, HEALTH_BYTES
+
+    payload = STATIC_PAYLOADS.get(path)
+    if payload is None:
+        return None
+
+    variants, cache_control = payload
+    accept = parse_accept_header(headers.get(b'accept-encoding', b'').decode('latin-1'))
+    encoding, body, etag = select_variant(variants, accept)
+    response_headers = [
+        (b'etag', quote_etag(etag).encode()),
+        (b'cache-control', cache_control.encode()),
+        (b'vary', b'Accept-Encoding')
+    ]
+    if parse_etags(headers.get(b'if-none-match', b'').decode('latin-1')).contains(etag):
+        return 304, response_headers, b''
+
+    response_headers.append((b'content-type', b'application/json'))
+    response_headers.append((b'content-length', str(len(body)).encode()))
+    if encoding != 'identity':
+        response_headers.append((b'content-encoding', encoding.encode()))
+    return 200, response_headers, body
+
+async def app(scope, receive, send):
+    """Serve the static endpoints without entering Flask; delegate everything else"""
+    if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD'):
+        # Match the Flask app, which does not enforce trailing slashes
+        path = scope['path'].rstrip('/') or '/'
+        result = _static(path, dict(scope['headers']))
+        if result is not None:
+            status, headers, body = result
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            await send({'type': 'http.response.body',
+                        'body': b'' if scope['method'] == 'HEAD' else body})
+            return
+    await flask_app(scope, receive, send)
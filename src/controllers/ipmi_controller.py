@@ -1,6 +1,14 @@
-from flask import Blueprint, jsonify, request
-from services.ipmi_service import IPMIService, MultiServerIPMIService
-from utils.validators import validate_request
+from flask import Blueprint, g, request, url_for
+from flask.views import MethodView
+from services.ipmi_service import MultiServerIPMIService
+from utils.responses import body_etag, conditional_response, encode_json, ojsonify, stream_json
+from utils.metrics import measure
+from utils.result_cache import cache_headers, cached_call, invalidate
+from utils.single_flight import single_flight
+from utils.task_queue import get_task, submit_task
+from utils.validators import VALID_BOOT_DEVICES, validate_boot_device
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+import functools
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,485 +18,454 @@ ipmi_bp = Blueprint('ipmi', __name__)
 # Initialize services
 try:
     multi_server_service = MultiServerIPMIService()
-    ipmi_service = IPMIService()  # Default service for backward compatibility
+    ipmi_service = multi_server_service.base_service  # Default service for backward compatibility
 except Exception as e:
-    logger.error(f"Failed to initialize IPMI services: {str(e)}")
+    logger.error("Failed to initialize IPMI services: %s", e)
     multi_server_service = None
     ipmi_service = None
 
+# Upper bound for the system_events limit parameter
+_MAX_EVENT_LIMIT = 10000
+
+# Constant parts of the response bodies, spliced into each response
+_SERVICE_NOT_INITIALIZED = {'status': 'error', 'message': 'IPMI service not initialized'}
+_MULTI_SERVER_UNAVAILABLE = {'status': 'error', 'message': 'Multi-server service not available'}
+_JSON_BODY_REQUIRED = {'status': 'error', 'message': 'JSON request body required'}
+_MISSING_DEVICE = {'status': 'error', 'message': 'Missing required parameter: device'}
+_VALID_DEVICE_LIST = list(VALID_BOOT_DEVICES)
+
+_SUCCESS = {'status': 'success'}
+_IPMI_HEALTHY = {'status': 'healthy', 'service': 'ipmi'}
+_IPMI_UNHEALTHY = {'status': 'unhealthy', 'service': 'ipmi'}
+
+_POWER_ON_OK = {'status': 'success', 'message': 'Server power on command sent'}
+_POWER_ON_FAILED = {'status': 'error', 'message': 'Failed to power on server'}
+_POWER_OFF_OK = {
+    True: {'status': 'success', 'message': 'Server power off command sent'},
+    False: {'status': 'success', 'message': 'Server power soft shutdown command sent'}
+}
+_POWER_OFF_FAILED = {'status': 'error', 'message': 'Failed to power off server'}
+_POWER_STATUS_FAILED = {'status': 'error', 'message': 'Failed to get power status'}
+_POWER_RESET_OK = {'status': 'success', 'message': 'Server reset command sent'}
+_POWER_RESET_FAILED = {'status': 'error', 'message': 'Failed to reset server'}
+
+_SYSTEM_INFO_FAILED = {'status': 'error', 'message': 'Failed to get system information'}
+_SENSORS_FAILED = {'status': 'error', 'message': 'Failed to get sensor data'}
+_EVENTS_FAILED = {'status': 'error', 'message': 'Failed to get system event log'}
+_CLEAR_EVENTS_OK = {'status': 'success', 'message': 'System event log cleared'}
+_CLEAR_EVENTS_FAILED = {'status': 'error', 'message': 'Failed to clear system event log'}
+_SEL_INFO_FAILED = {'status': 'error', 'message': 'Failed to get SEL information'}
+_BOOT_DEVICE_FAILED = {'status': 'error', 'message': 'Failed to get boot device'}
+_SET_BOOT_DEVICE_FAILED = {'status': 'error', 'message': 'Failed to set boot device'}
+
+_SERVERS_STATUS_OK = {'status': 'success', 'operation': 'get_power_status'}
+_BULK_POWER_ON_OK = {'status': 'success', 'operation': 'bulk_power_on'}
+_BULK_POWER_OFF_OK = {'status': 'success', 'operation': 'bulk_power_off'}
+_BULK_SENSOR_READINGS_OK = {'status': 'success', 'operation': 'bulk_sensor_readings'}
+_TASK_PENDING = {'status': 'pending'}
+_TASK_NOT_FOUND = {'status': 'error', 'message': 'Task not found'}
+
+# Bulk operations that change power state
+_POWER_COMMANDS = frozenset({'power_on', 'power_off'})
+
 def get_server_service(server_id: str = None):
-    """Get IPMIService instance for specific server or default"""
-    if server_id:
-        return IPMIService(server_id=server_id)
+    """Get IPMIService instance for specific server or default
+
+    Instances come from multi_server_service's registry, shared with the
+    bulk endpoints. Unknown IDs raise ValueError.
+    """
+    if server_id and multi_server_service:
+        return multi_server_service.get_service_for_server(server_id)
     return ipmi_service
 
-def handle_server_parameter():
-    """Extract server_id from request parameters"""
-    server_id = request.args.get('server_id') or request.json.get('server_id') if request.is_json else None
-    return server_id
+@functools.lru_cache(maxsize=4)
+def _servers_body(servers):
+    """Encoded server list body and its ETag, rebuilt only when the configured servers change"""
+    body = encode_json({
+        'status': 'success',
+        'servers': list(servers),
+        'count': len(servers)
+    })
+    return body, body_etag(body)
+
+def handle_server_parameter(body=None):
+    """Extract server_id from request parameters
+
+    Handlers that already parsed the JSON body pass it in to avoid a second lookup.
+    """
+    # Query string wins; the JSON body is only parsed when it is needed
+    server_id = request.args.get('server_id')
+    if server_id:
+        return server_id
+    if body is None:
+        body = request.get_json(silent=True, cache=True) or {}
+    return body.get('server_id')
+
+class IPMIView(MethodView):
+    """Base view for single-server endpoints
+
+    The JSON body, server_id and service are resolved once into the view
+    instance (a new one per request) before the method handler runs, and
+    any exception becomes a 500 error body. Latency is recorded per
+    endpoint and server.
+    """
+
+    decorators = [measure]
+
+    def dispatch_request(self, **kwargs):
+        g.metrics_server = 'unknown'
+        try:
+            self.body = request.get_json(silent=True) or {}
+            self.server_id = handle_server_parameter(self.body)
+            self.service = get_server_service(self.server_id)
+            if self.service:
+                g.metrics_server = self.service.server_id or 'default'
+            return super().dispatch_request(**kwargs)
+        except Exception as e:
+            logger.error("Error in %s: %s", request.endpoint, e)
+            return ojsonify({'status': 'error', 'message': str(e)}, 500)
+
+    @staticmethod
+    def failure(failed, result):
+        """Error body for a failed service result"""
+        return ojsonify({
+            **failed,
+            'error': result['error'],
+            'server_id': result.get('server_id'),
+            'hostname': result.get('hostname')
+        }, 500)
+
+# Single-call endpoints, generated from a spec table
+class RouteSpec(NamedTuple):
+    """Endpoint that calls one service method and reports its result"""
+    rule: str
+    method: str
+    endpoint: str
+    operation: str
+    description: str
+    ok: Dict[str, Any]
+    failed: Dict[str, Any]
+    # (body key, result key) pairs copied into the success body
+    fields: Tuple[Tuple[str, str], ...] = (('output', 'output'),)
+    report_error: bool = True
+    cache: Optional[str] = None
+    invalidates: Optional[str] = None
+    single_flight: bool = False
+    etag: bool = False
+
+_ROUTES: Tuple[RouteSpec, ...] = (
+    RouteSpec('/power/on', 'POST', 'power_on', 'power_on',
+              'Power on the server',
+              _POWER_ON_OK, _POWER_ON_FAILED,
+              invalidates='power_status'),
+    RouteSpec('/power/status', 'GET', 'power_status', 'get_power_status',
+              'Get current power status of the server',
+              _SUCCESS, _POWER_STATUS_FAILED,
+              (('power_state', 'power_state'), ('output', 'output')),
+              cache='power_status'),
+    RouteSpec('/power/reset', 'POST', 'power_reset', 'power_reset',
+              'Reset the server',
+              _POWER_RESET_OK, _POWER_RESET_FAILED,
+              invalidates='power_status'),
+    RouteSpec('/system/info', 'GET', 'system_info', 'get_system_info',
+              'Get comprehensive system information',
+              _SUCCESS, _SYSTEM_INFO_FAILED,
+              (('system_info', 'system_info'),),
+              report_error=False,
+              cache='system_info',
+              etag=True),
+    RouteSpec('/system/sensors', 'GET', 'sensor_readings', 'get_sensor_data',
+              'Get all sensor readings',
+              _SUCCESS, _SENSORS_FAILED,
+              (('sensors', 'sensors'), ('sensor_count', 'sensor_count')),
+              cache='sensor_readings'),
+    RouteSpec('/system/events', 'DELETE', 'clear_system_events', 'clear_system_event_log',
+              'Clear system event log',
+              _CLEAR_EVENTS_OK, _CLEAR_EVENTS_FAILED,
+              invalidates='sel_info'),
+    RouteSpec('/system/events/info', 'GET', 'sel_info', 'get_sel_info',
+              'Get SEL information and statistics',
+              _SUCCESS, _SEL_INFO_FAILED,
+              (('sel_info', 'output'),),
+              cache='sel_info'),
+    RouteSpec('/boot/device', 'GET', 'get_boot_device', 'get_boot_device',
+              'Get current boot device',
+              _SUCCESS, _BOOT_DEVICE_FAILED,
+              (('boot_device', 'boot_device'), ('raw_output', 'output')),
+              single_flight=True,
+              etag=True),
+)
+
+# Last encoded body per (endpoint, server) for ETag routes served through
+# cached_call, tagged with the result object it was built from so a new result
+# is always re-encoded. Uncached routes get a fresh result every call.
+_encoded_bodies = {}
+
+class OperationView(IPMIView):
+    """Calls the service method named by a RouteSpec and reports its result"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.headers = cache_headers(spec.cache) if spec.cache else None
+
+    def handle(self):
+        spec = self.spec
+        service = self.service
+        method = getattr(service, spec.operation)
+        
+        if spec.cache:
+            result = cached_call(spec.cache, service.server_id, method)
+        elif spec.single_flight:
+            result = single_flight((spec.endpoint, service.server_id), method)
+        else:
+            result = method()
+        if spec.invalidates:
+            invalidate(spec.invalidates, service.server_id)
+        
+        if result['success']:
+            body = {**spec.ok}
+            for key, source in spec.fields:
+                body[key] = result[source]
+            status = 200
+        else:
+            body = {**spec.failed}
+            if spec.report_error:
+                body['error'] = result['error']
+            status = 500
+        body['server_id'] = result.get('server_id')
+        body['hostname'] = result.get('hostname')
+        if status == 200 and spec.etag:
+            if spec.cache:
+                return conditional_response(*self.encoded(result, body), self.headers)
+            data = encode_json(body)
+            return conditional_response(data, body_etag(data), self.headers)
+        return ojsonify(body, status, self.headers if status == 200 else None)
+
+    def encoded(self, result, body):
+        """(body bytes, etag), reused while the same cached result is being served"""
+        key = (self.spec.endpoint, self.service.server_id)
+        entry = _encoded_bodies.get(key)
+        if entry is not None and entry[0] is result:
+            return entry[1], entry[2]
+        data = encode_json(body)
+        etag = body_etag(data)
+        _encoded_bodies[key] = (result, data, etag)
+        return data, etag
+
+    # Each spec is registered for exactly one HTTP method
+    get = post = delete = handle
+
+for _spec in _ROUTES:
+    _view = OperationView.as_view(_spec.endpoint, _spec)
+    _view.__doc__ = _spec.description
+    ipmi_bp.add_url_rule(_spec.rule, view_func=_view, methods=[_spec.method])
 
 # Health Check Endpoints
-@ipmi_bp.route('/health', methods=['GET'])
-def ipmi_health():
+class HealthView(IPMIView):
     """IPMI health check endpoint"""
-    try:
-        server_id = handle_server_parameter()
-        service = get_server_service(server_id)
-        
-        if not service:
-            return jsonify({'status': 'error', 'message': 'IPMI service not initialized'}), 500
+
+    def get(self):
+        if not self.service:
+            return ojsonify(_SERVICE_NOT_INITIALIZED, 500)
             
-        result = service.check_health()
+        result = self.service.check_health()
         if result['success']:
-            return jsonify({
-                'status': 'healthy',
-                'service': 'ipmi',
+            return ojsonify({
+                **_IPMI_HEALTHY,
                 'details': result['details']
-            }), 200
+            }, 200)
         else:
-            return jsonify({
-                'status': 'unhealthy',
-                'service': 'ipmi',
+            return ojsonify({
+                **_IPMI_UNHEALTHY,
                 'error': result['error']
-            }), 503
-    except Exception as e:
-        logger.error(f"Error in ipmi_health: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+            }, 503)
+
+ipmi_bp.add_url_rule('/health', view_func=HealthView.as_view('ipmi_health'))
 
 # Server Management Endpoints
 @ipmi_bp.route('/servers', methods=['GET'])
+@measure
 def list_servers():
     """List all available servers"""
     try:
         if not multi_server_service:
-            return jsonify({'status': 'error', 'message': 'Multi-server service not available'}), 500
+            return ojsonify(_MULTI_SERVER_UNAVAILABLE, 500)
             
-        servers = multi_server_service.servers
-        return jsonify({
-            'status': 'success',
-            'servers': servers,
-            'count': len(servers)
-        }), 200
+        return conditional_response(*_servers_body(tuple(multi_server_service.servers)))
     except Exception as e:
-        logger.error(f"Error in list_servers: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        logger.error("Error in list_servers: %s", e)
+        return ojsonify({'status': 'error', 'message': str(e)}, 500)
 
 @ipmi_bp.route('/servers/status', methods=['GET'])
+@measure
 def all_servers_status():
     """Get power status of all servers"""
     try:
         if not multi_server_service:
-            return jsonify({'status': 'error', 'message': 'Multi-server service not available'}), 500
+            return ojsonify(_MULTI_SERVER_UNAVAILABLE, 500)
             
-        result = multi_server_service.get_servers_status()
-        return jsonify({
-            'status': 'success',
-            'operation': result['operation'],
-            'summary': {
-                'total_servers': result['total_servers'],
-                'successful': result['successful'],
-                'failed': result['total_servers'] - result['successful']
-            },
-            'results': result['results']
-        }), 200
+        return _run_bulk(single_flight, ('servers_status',), _bulk_result, _SERVERS_STATUS_OK, 'get_power_status')
     except Exception as e:
-        logger.error(f"Error in all_servers_status: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        logger.error("Error in all_servers_status: %s", e)
+        return ojsonify({'status': 'error', 'message': str(e)}, 500)
 
 # Power Management Endpoints
-@ipmi_bp.route('/power/on', methods=['POST'])
-def power_on():
-    """Power on the server"""
-    try:
-        server_id = handle_server_parameter()
-        service = get_server_service(server_id)
-        
-        result = service.power_on()
-        if result['success']:
-            return jsonify({
-                'status': 'success',
-                'message': 'Server power on command sent',
-                'output': result['output'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 200
-        else:
-            return jsonify({
-                'status': 'error',
-                'message': 'Failed to power on server',
-                'error': result['error'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 500
-    except Exception as e:
-        logger.error(f"Error in power_on: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
-
-@ipmi_bp.route('/power/off', methods=['POST'])
-def power_off():
+class PowerOffView(IPMIView):
     """Power off the server"""
-    try:
-        server_id = handle_server_parameter()
-        service = get_server_service(server_id)
-        
+
+    def post(self):
         # Check for force parameter
-        force = request.json.get('force', False) if request.is_json else False
+        force = self.body.get('force', False)
         
-        result = service.power_off(force=force)
-        if result['success']:
-            return jsonify({
-                'status': 'success',
-                'message': f"Server power {'off' if force else 'soft shutdown'} command sent",
-                'output': result['output'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 200
-        else:
-            return jsonify({
-                'status': 'error',
-                'message': 'Failed to power off server',
-                'error': result['error'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 500
-    except Exception as e:
-        logger.error(f"Error in power_off: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        result = self.service.power_off(force=force)
+        invalidate('power_status', self.service.server_id)
+        if not result['success']:
+            return self.failure(_POWER_OFF_FAILED, result)
+        return ojsonify({
+            **_POWER_OFF_OK[bool(force)],
+            'output': result['output'],
+            'server_id': result.get('server_id'),
+            'hostname': result.get('hostname')
+        }, 200)
 
-@ipmi_bp.route('/power/status', methods=['GET'])
-def power_status():
-    """Get current power status of the server"""
-    try:
-        server_id = handle_server_parameter()
-        service = get_server_service(server_id)
-        
-        result = service.get_power_status()
-        if result['success']:
-            return jsonify({
-                'status': 'success',
-                'power_state': result['power_state'],
-                'output': result['output'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 200
-        else:
-            return jsonify({
-                'status': 'error',
-                'message': 'Failed to get power status',
-                'error': result['error'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 500
-    except Exception as e:
-        logger.error(f"Error in power_status: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
-
-@ipmi_bp.route('/power/reset', methods=['POST'])
-def power_reset():
-    """Reset the server"""
-    try:
-        server_id = handle_server_parameter()
-        service = get_server_service(server_id)
-        
-        result = service.power_reset()
-        if result['success']:
-            return jsonify({
-                'status': 'success',
-                'message': 'Server reset command sent',
-                'output': result['output'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 200
-        else:
-            return jsonify({
-                'status': 'error',
-                'message': 'Failed to reset server',
-                'error': result['error'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 500
-    except Exception as e:
-        logger.error(f"Error in power_reset: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+ipmi_bp.add_url_rule('/power/off', view_func=PowerOffView.as_view('power_off'))
 
 # System Information Endpoints
-@ipmi_bp.route('/system/info', methods=['GET'])
-def system_info():
-    """Get comprehensive system information"""
-    try:
-        server_id = handle_server_parameter()
-        service = get_server_service(server_id)
-        
-        result = service.get_system_info()
-        if result['success']:
-            return jsonify({
-                'status': 'success',
-                'system_info': result['system_info'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 200
-        else:
-            return jsonify({
-                'status': 'error',
-                'message': 'Failed to get system information',
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 500
-    except Exception as e:
-        logger.error(f"Error in system_info: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
-
-@ipmi_bp.route('/system/sensors', methods=['GET'])
-def sensor_readings():
-    """Get all sensor readings"""
-    try:
-        server_id = handle_server_parameter()
-        service = get_server_service(server_id)
-        
-        result = service.get_sensor_data()
-        if result['success']:
-            return jsonify({
-                'status': 'success',
-                'sensors': result['sensors'],
-                'sensor_count': result['sensor_count'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 200
-        else:
-            return jsonify({
-                'status': 'error',
-                'message': 'Failed to get sensor data',
-                'error': result['error'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 500
-    except Exception as e:
-        logger.error(f"Error in sensor_readings: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
-
-@ipmi_bp.route('/system/events', methods=['GET'])
-def system_events():
+class SystemEventsView(IPMIView):
     """Get system event log"""
-    try:
-        server_id = handle_server_parameter()
-        service = get_server_service(server_id)
-        
-        # Get limit from query parameters
-        limit = request.args.get('limit', 50, type=int)
-        
-        result = service.get_system_event_log(limit=limit)
-        if result['success']:
-            return jsonify({
-                'status': 'success',
-                'events': result['events'],
-                'event_count': result['event_count'],
-                'limit': limit,
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 200
-        else:
-            return jsonify({
-                'status': 'error',
-                'message': 'Failed to get system event log',
-                'error': result['error'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 500
-    except Exception as e:
-        logger.error(f"Error in system_events: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
 
-@ipmi_bp.route('/system/events', methods=['DELETE'])
-def clear_system_events():
-    """Clear system event log"""
-    try:
-        server_id = handle_server_parameter()
-        service = get_server_service(server_id)
+    def get(self):
+        # Get limit from query parameters, clamped so a single request cannot pull an unbounded SEL
+        limit = max(1, min(request.args.get('limit', 50, type=int), _MAX_EVENT_LIMIT))
         
-        result = service.clear_system_event_log()
-        if result['success']:
-            return jsonify({
-                'status': 'success',
-                'message': 'System event log cleared',
-                'output': result['output'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 200
-        else:
-            return jsonify({
-                'status': 'error',
-                'message': 'Failed to clear system event log',
-                'error': result['error'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 500
-    except Exception as e:
-        logger.error(f"Error in clear_system_events: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        result = self.service.get_system_event_log(limit=limit)
+        if not result['success']:
+            return self.failure(_EVENTS_FAILED, result)
+        return stream_json(_SUCCESS, 'events', result['events'], {
+            'event_count': result['event_count'],
+            'limit': limit,
+            'server_id': result.get('server_id'),
+            'hostname': result.get('hostname')
+        })
 
-@ipmi_bp.route('/system/events/info', methods=['GET'])
-def sel_info():
-    """Get SEL information and statistics"""
-    try:
-        server_id = handle_server_parameter()
-        service = get_server_service(server_id)
-        
-        result = service.get_sel_info()
-        if result['success']:
-            return jsonify({
-                'status': 'success',
-                'sel_info': result['output'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 200
-        else:
-            return jsonify({
-                'status': 'error',
-                'message': 'Failed to get SEL information',
-                'error': result['error'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 500
-    except Exception as e:
-        logger.error(f"Error in sel_info: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+ipmi_bp.add_url_rule('/system/events', view_func=SystemEventsView.as_view('system_events'), methods=['GET'])
 
 # Boot Management Endpoints
-@ipmi_bp.route('/boot/device', methods=['GET'])
-def get_boot_device():
-    """Get current boot device"""
-    try:
-        server_id = handle_server_parameter()
-        service = get_server_service(server_id)
-        
-        result = service.get_boot_device()
-        if result['success']:
-            return jsonify({
-                'status': 'success',
-                'boot_device': result['boot_device'],
-                'raw_output': result['output'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 200
-        else:
-            return jsonify({
-                'status': 'error',
-                'message': 'Failed to get boot device',
-                'error': result['error'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 500
-    except Exception as e:
-        logger.error(f"Error in get_boot_device: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
-
-@ipmi_bp.route('/boot/device', methods=['POST'])
-def set_boot_device():
+class SetBootDeviceView(IPMIView):
     """Set boot device (pxe, disk, cdrom, bios)"""
-    try:
-        server_id = handle_server_parameter()
-        service = get_server_service(server_id)
-        
+
+    def post(self):
         if not request.is_json:
-            return jsonify({'status': 'error', 'message': 'JSON request body required'}), 400
+            return ojsonify(_JSON_BODY_REQUIRED, 400)
         
-        device = request.json.get('device')
-        persistent = request.json.get('persistent', False)
+        device = self.body.get('device')
+        persistent = bool(self.body.get('persistent', False))
         
         if not device:
-            return jsonify({
+            return ojsonify(_MISSING_DEVICE, 400)
+        # Reject unknown devices before spawning ipmitool
+        if not validate_boot_device(device):
+            return ojsonify({
                 'status': 'error',
-                'message': 'Missing required parameter: device'
-            }), 400
+                'message': f"Invalid boot device '{device}'",
+                'valid_devices': _VALID_DEVICE_LIST
+            }, 400)
         
-        result = service.set_boot_device(device, persistent=persistent)
-        if result['success']:
-            return jsonify({
-                'status': 'success',
-                'message': f"Boot device set to {device}",
-                'output': result['output'],
-                'device': device,
-                'persistent': persistent,
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 200
-        else:
-            return jsonify({
-                'status': 'error',
-                'message': 'Failed to set boot device',
-                'error': result['error'],
-                'server_id': result.get('server_id'),
-                'hostname': result.get('hostname')
-            }), 500
-    except Exception as e:
-        logger.error(f"Error in set_boot_device: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        result = self.service.set_boot_device(device, persistent=persistent)
+        if not result['success']:
+            return self.failure(_SET_BOOT_DEVICE_FAILED, result)
+        return ojsonify({
+            'status': 'success',
+            'message': f"Boot device set to {device}",
+            'output': result['output'],
+            'device': device,
+            'persistent': persistent,
+            'server_id': result.get('server_id'),
+            'hostname': result.get('hostname')
+        }, 200)
+
+ipmi_bp.add_url_rule('/boot/device', view_func=SetBootDeviceView.as_view('set_boot_device'), methods=['POST'])
 
 # Bulk Operations Endpoints
+def _bulk_result(head, operation, **kwargs):
+    """Run an operation on all servers, returning the body head and per-server results"""
+    result = multi_server_service.execute_on_all_servers(operation, **kwargs)
+    if operation in _POWER_COMMANDS:
+        invalidate('power_status')
+    return {
+        **head,
+        'summary': {
+            'total_servers': result['total_servers'],
+            'successful': result['successful'],
+            'failed': result['total_servers'] - result['successful']
+        }
+    }, result['results']
+
+def _run_bulk(func, *args, **kwargs):
+    """Run a bulk operation inline, or as a background task with ?async=true"""
+    if request.args.get('async', 'false').lower() == 'true':
+        task_id = submit_task(func, *args, **kwargs)
+        return ojsonify({
+            **_TASK_PENDING,
+            'task_id': task_id,
+            'task_url': url_for('ipmi.bulk_task_status', task_id=task_id)
+        }, 202)
+    head, results = func(*args, **kwargs)
+    return stream_json(head, 'results', results)
+
 @ipmi_bp.route('/bulk/power/on', methods=['POST'])
+@measure
 def bulk_power_on():
     """Power on all servers"""
     try:
         if not multi_server_service:
-            return jsonify({'status': 'error', 'message': 'Multi-server service not available'}), 500
+            return ojsonify(_MULTI_SERVER_UNAVAILABLE, 500)
             
-        result = multi_server_service.execute_on_all_servers('power_on')
-        return jsonify({
-            'status': 'success',
-            'operation': 'bulk_power_on',
-            'summary': {
-                'total_servers': result['total_servers'],
-                'successful': result['successful'],
-                'failed': result['total_servers'] - result['successful']
-            },
-            'results': result['results']
-        }), 200
+        return _run_bulk(_bulk_result, _BULK_POWER_ON_OK, 'power_on')
     except Exception as e:
-        logger.error(f"Error in bulk_power_on: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        logger.error("Error in bulk_power_on: %s", e)
+        return ojsonify({'status': 'error', 'message': str(e)}, 500)
 
 @ipmi_bp.route('/bulk/power/off', methods=['POST'])
+@measure
 def bulk_power_off():
     """Power off all servers"""
     try:
         if not multi_server_service:
-            return jsonify({'status': 'error', 'message': 'Multi-server service not available'}), 500
+            return ojsonify(_MULTI_SERVER_UNAVAILABLE, 500)
         
-        force = request.json.get('force', False) if request.is_json else False
-        result = multi_server_service.execute_on_all_servers('power_off', force=force)
-        return jsonify({
-            'status': 'success',
-            'operation': 'bulk_power_off',
-            'force': force,
-            'summary': {
-                'total_servers': result['total_servers'],
-                'successful': result['successful'],
-                'failed': result['total_servers'] - result['successful']
-            },
-            'results': result['results']
-        }), 200
+        body = request.get_json(silent=True) or {}
+        force = body.get('force', False)
+        return _run_bulk(_bulk_result, {**_BULK_POWER_OFF_OK, 'force': force}, 'power_off', force=force)
     except Exception as e:
-        logger.error(f"Error in bulk_power_off: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        logger.error("Error in bulk_power_off: %s", e)
+        return ojsonify({'status': 'error', 'message': str(e)}, 500)
 
 @ipmi_bp.route('/bulk/sensors', methods=['GET'])
+@measure
 def bulk_sensor_readings():
     """Get sensor readings from all servers"""
     try:
         if not multi_server_service:
-            return jsonify({'status': 'error', 'message': 'Multi-server service not available'}), 500
+            return ojsonify(_MULTI_SERVER_UNAVAILABLE, 500)
             
-        result = multi_server_service.execute_on_all_servers('get_sensor_data')
-        return jsonify({
-            'status': 'success',
-            'operation': 'bulk_sensor_readings',
-            'summary': {
-                'total_servers': result['total_servers'],
-                'successful': result['successful'],
-                'failed': result['total_servers'] - result['successful']
-            },
-            'results': result['results']
-        }), 200
+        return _run_bulk(_bulk_result, _BULK_SENSOR_READINGS_OK, 'get_sensor_data')
+    except Exception as e:
+        logger.error("Error in bulk_sensor_readings: %s", e)
+        return ojsonify({'status': 'error', 'message': str(e)}, 500)
+
+@ipmi_bp.route('/bulk/tasks/<task_id>', methods=['GET'])
+@measure
+def bulk_task_status(task_id):
+    """Get the result of a background bulk operation"""
+    future = get_task(task_id)
+    if future is None:
+        return ojsonify(_TASK_NOT_FOUND, 404)
+    if not future.done():
+        return ojsonify({**_TASK_PENDING, 'task_id': task_id}, 202)
+    try:
+        head, results = future.result()
     except Exception as e:
-        logger.error(f"Error in bulk_sensor_readings: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
\ No newline at end of file
+        logger.error("Error in bulk task %s: %s", task_id, e)
+        return ojsonify({'status': 'error', 'message': str(e)}, 500)
+    return stream_json(head, 'results', results)
@@ -0,0 +1,269 @@
+from flask import Blueprint, Response, request
+from utils.metrics import render_metrics
+from utils.responses import OrjsonResponse, body_etag
+from utils.validators import VALID_BOOT_DEVICES
+import brotli
+import gzip
+import orjson
+import os
+from typing import Any, NamedTuple, Tuple
+
+meta_bp = Blueprint('meta', __name__)
+
+def _precompress(body):
+    """Build identity, brotli and gzip variants of a body, each with its own ETag"""
+    etag = body_etag(body)
+    return {
+        'identity': (body, etag),
+        'br': (brotli.compress(body, quality=11), etag + '-br'),
+        'gzip': (gzip.compress(body, 9), etag + '-gzip')
+    }
+
+def select_variant(variants, accept_encodings):
+    """Pick (encoding, body, etag), preferring br over gzip over identity"""
+    encoding = accept_encodings.best_match(('br', 'gzip'), default='identity')
+    body, etag = variants[encoding]
+    return encoding, body, etag
+
+def _static_response(variants, cache_control):
+    """Return the best precomputed variant, or 304 if the client already has it"""
+    encoding, body, etag = select_variant(variants, request.accept_encodings)
+    if request.if_none_match.contains(etag):
+        response = OrjsonResponse(status=304)
+    else:
+        response = OrjsonResponse(body, 200)
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+# Static payloads, serialized once at import time
+HEALTH_BYTES = orjson.dumps({'status': 'healthy', 'service': 'ipmi-api-gateway'})
+
+class EndpointSpec(NamedTuple):
+    """Single entry of the API endpoint catalog"""
+    group: str
+    name: str
+    url: str
+    method: str
+    description: str
+    parameters: Tuple[str, ...] = ()
+    response: str = ''
+    extras: Tuple[Tuple[str, Any], ...] = ()
+
+# Values repeated across the catalog
+_GET = 'GET'
+_POST = 'POST'
+_DELETE = 'DELETE'
+_SERVER_ID = 'server_id (optional)'
+_FORCE = 'force (boolean, default: false)'
+_FORCE_EXAMPLE = '{"force": true}'
+_ASYNC = 'async (boolean, default: false)'
+_PER_SERVER_RESULTS = '200: Results for each server, 202: Task accepted (async=true)'
+
+# Endpoint catalog shared by the / and /api/v1/docs views
+_ENDPOINTS: Tuple[EndpointSpec, ...] = (
+    EndpointSpec('health_endpoints', 'health_check', '/health', _GET,
+                 'Check API service health',
+                 response='200: Service healthy'),
+    EndpointSpec('health_endpoints', 'metrics', '/metrics', _GET,
+                 'Prometheus metrics for API requests',
+                 response='200: Prometheus text format'),
+    EndpointSpec('health_endpoints', 'ipmi_health', '/api/v1/health', _GET,
+                 'Check IPMI connection health',
+                 (_SERVER_ID,),
+                 '200: IPMI healthy, 503: IPMI unhealthy'),
+    EndpointSpec('server_management', 'list_servers', '/api/v1/servers', _GET,
+                 'List all configured servers',
+                 response='200: List of server IDs'),
+    EndpointSpec('server_management', 'all_servers_status', '/api/v1/servers/status', _GET,
+                 'Get power status of all servers',
+                 (_ASYNC,),
+                 '200: Power status for each server, 202: Task accepted (async=true)'),
+    EndpointSpec('power_management', 'power_status', '/api/v1/power/status', _GET,
+                 'Get current power status',
+                 (_SERVER_ID,),
+                 '200: Power state (on/off/unknown)'),
+    EndpointSpec('power_management', 'power_on', '/api/v1/power/on', _POST,
+                 'Power on server',
+                 (_SERVER_ID,),
+                 '200: Power on command sent'),
+    EndpointSpec('power_management', 'power_off', '/api/v1/power/off', _POST,
+                 'Power off server (graceful or forced)',
+                 (_SERVER_ID, _FORCE),
+                 '200: Power off command sent',
+                 (('body_example', _FORCE_EXAMPLE),)),
+    EndpointSpec('power_management', 'power_reset', '/api/v1/power/reset', _POST,
+                 'Reset server',
+                 (_SERVER_ID,),
+                 '200: Reset command sent'),
+    EndpointSpec('system_information', 'system_info', '/api/v1/system/info', _GET,
+                 'Get comprehensive system information (FRU, BMC, chassis)',
+                 (_SERVER_ID,),
+                 '200: System information object'),
+    EndpointSpec('system_information', 'sensor_readings', '/api/v1/system/sensors', _GET,
+                 'Get all sensor readings (temperature, voltage, fans)',
+                 (_SERVER_ID,),
+                 '200: Array of sensor readings'),
+    EndpointSpec('system_information', 'system_events', '/api/v1/system/events', _GET,
+                 'Get system event log entries',
+                 (_SERVER_ID, 'limit (integer, default: 50, max: 10000)'),
+                 '200: Array of event log entries'),
+    EndpointSpec('system_information', 'clear_events', '/api/v1/system/events', _DELETE,
+                 'Clear system event log',
+                 (_SERVER_ID,),
+                 '200: Event log cleared'),
+    EndpointSpec('system_information', 'sel_info', '/api/v1/system/events/info', _GET,
+                 'Get SEL information and statistics',
+                 (_SERVER_ID,),
+                 '200: SEL information'),
+    EndpointSpec('boot_management', 'get_boot_device', '/api/v1/boot/device', _GET,
+                 'Get current boot device configuration',
+                 (_SERVER_ID,),
+                 '200: Boot device information'),
+    EndpointSpec('boot_management', 'set_boot_device', '/api/v1/boot/device', _POST,
+                 'Set next boot device',
+                 (_SERVER_ID, 'device (required)', 'persistent (boolean, default: false)'),
+                 '200: Boot device set',
+                 (('body_example', '{"device": "pxe", "persistent": true}'),
+                  ('valid_devices', list(VALID_BOOT_DEVICES)))),
+    EndpointSpec('bulk_operations', 'bulk_power_on', '/api/v1/bulk/power/on', _POST,
+                 'Power on all configured servers',
+                 (_ASYNC,),
+                 _PER_SERVER_RESULTS),
+    EndpointSpec('bulk_operations', 'bulk_power_off', '/api/v1/bulk/power/off', _POST,
+                 'Power off all configured servers',
+                 (_FORCE, _ASYNC),
+                 _PER_SERVER_RESULTS,
+                 (('body_example', _FORCE_EXAMPLE),)),
+    EndpointSpec('bulk_operations', 'bulk_sensors', '/api/v1/bulk/sensors', _GET,
+                 'Get sensor readings from all configured servers',
+                 (_ASYNC,),
+                 '200: Sensor data for each server, 202: Task accepted (async=true)'),
+    EndpointSpec('bulk_operations', 'bulk_task_status', '/api/v1/bulk/tasks/<task_id>', _GET,
+                 'Get the result of a bulk operation started with async=true',
+                 response='200: Operation result, 202: Still running, 404: Unknown or expired task'),
+)
+
+# Group names used by the / view; None places the entry at the top level
+_ROOT_GROUPS = {
+    'health_endpoints': None,
+    'server_management': 'servers',
+    'power_management': 'power_management',
+    'system_information': 'system_information',
+    'boot_management': 'boot_management',
+    'bulk_operations': 'bulk_operations'
+}
+
+def _root_entry(spec):
+    entry = {'url': spec.url, 'method': spec.method, 'description': spec.description}
+    if spec.parameters:
+        entry['parameters'] = ', '.join(spec.parameters)
+    return entry
+
+def _docs_entry(spec):
+    entry = {'endpoint': spec.url, 'method': spec.method, 'description': spec.description}
+    if spec.parameters:
+        entry['parameters'] = list(spec.parameters)
+    entry.update(spec.extras)
+    entry['response'] = spec.response
+    return entry
+
+def _build_root_endpoints():
+    endpoints = {}
+    for spec in _ENDPOINTS:
+        group = _ROOT_GROUPS[spec.group]
+        target = endpoints if group is None else endpoints.setdefault(group, {})
+        target[spec.name] = _root_entry(spec)
+    return endpoints
+
+def _build_docs_endpoints():
+    endpoints = {}
+    for spec in _ENDPOINTS:
+        endpoints.setdefault(spec.group, []).append(_docs_entry(spec))
+    return endpoints
+
+_ROOT_BYTES = orjson.dumps({
+    'service': 'IPMI API Gateway',
+    'version': '2.0.0',
+    'description': 'API Gateway for IPMI operations with multi-server support',
+    'endpoints': _build_root_endpoints(),
+    'usage_notes': {
+        'server_id': 'Optional parameter to target specific server. Can be passed as query parameter (?server_id=server1) or in JSON body',
+        'multi_server_config': 'Set IPMI_HOSTS environment variable with format: server1:ip1:user:pass,server2:ip2:user:pass',
+        'single_server_config': 'Set IPMI_HOST, IPMI_USER, and IPMI_PASSWORD environment variables'
+    }
+})
+
+_DOCS_BYTES = orjson.dumps({
+    'api_documentation': {
+        'version': '2.0.0',
+        'base_url': '/api/v1',
+        'authentication': 'None (configured via environment variables)',
+        'content_type': 'application/json',
+        'endpoints': _build_docs_endpoints(),
+        'error_responses': {
+            '400': 'Bad Request - Invalid parameters',
+            '404': 'Not Found - Endpoint not found',
+            '500': 'Internal Server Error - IPMI command failed',
+            '503': 'Service Unavailable - IPMI service unhealthy'
+        }
+    }
+})
+
+_ROOT_VARIANTS = _precompress(_ROOT_BYTES)
+_DOCS_VARIANTS = _precompress(_DOCS_BYTES)
+_STATIC_CACHE_CONTROL = 'public, max-age=300'
+
+# Shared by every probe request. Nothing in the app mutates returned responses
+# (no after_request hooks, no session), and Werkzeug copies the headers when
+# it starts the WSGI response, so one instance can be served concurrently.
+_HEALTH_RESPONSE = OrjsonResponse(HEALTH_BYTES, 200, headers={'Cache-Control': 'no-store'})
+
+# Precomputed payloads by path, also served directly by the ASGI front end
+STATIC_PAYLOADS = {
+    '/': (_ROOT_VARIANTS, _STATIC_CACHE_CONTROL),
+    '/api/v1/docs': (_DOCS_VARIANTS, _STATIC_CACHE_CONTROL)
+}
+
+# File names used when exporting the payloads for a fronting proxy
+_STATIC_FILES = {
+    'root.json': _ROOT_VARIANTS,
+    'docs.json': _DOCS_VARIANTS
+}
+_FILE_SUFFIXES = {'identity': '', 'gzip': '.gz', 'br': '.br'}
+
+def export_static_payloads(directory):
+    """Write the precomputed payloads to disk so a reverse proxy can serve them"""
+    os.makedirs(directory, exist_ok=True)
+    for name, variants in _STATIC_FILES.items():
+        for encoding, (body, _) in variants.items():
+            path = os.path.join(directory, name + _FILE_SUFFIXES[encoding])
+            # Write then rename so concurrently starting workers never expose a partial file
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+
+@meta_bp.route('/health', methods=['GET'])
+def health_check():
+    """Health check endpoint for Kubernetes"""
+    return _HEALTH_RESPONSE
+
+@meta_bp.route('/', methods=['GET'])
+def root():
+    """Root endpoint with API information"""
+    return _static_response(*STATIC_PAYLOADS['/'])
+
+@meta_bp.route('/api/v1/docs', methods=['GET'])
+def api_docs():
+    """Detailed API documentation endpoint"""
+    return _static_response(*STATIC_PAYLOADS['/api/v1/docs'])
+
+@meta_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics endpoint"""
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
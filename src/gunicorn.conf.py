@@ -0,0 +1,44 @@
+import os
+import sys
+
+from utils.settings import SETTINGS
+
+# On a free-threaded interpreter (3.13t with PYTHON_GIL=0) threads run Python
+# code in parallel, so one process with more threads replaces extra worker
+# processes and their duplicated memory
+_GIL_DISABLED = not getattr(sys, '_is_gil_enabled', lambda: True)()
+
+bind = f"0.0.0.0:{SETTINGS.port}"
+wsgi_app = 'app:create_app()'
+
+# gthread workers overlap the I/O-bound ipmitool calls; keep-alive avoids a TCP
+# handshake per request for polling clients
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('WEB_CONCURRENCY', 1 if _GIL_DISABLED else 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 32 if _GIL_DISABLED else 8))
+keepalive = 5
+
+# gthread stops accepting past this many open connections per worker and keeps
+# at most this minus `threads` idle keep-alive ones; gevent allows this many
+# concurrent greenlets per worker, having monkey-patched socket, subprocess and
+# threading before loading the app
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+def worker_exit(server, worker):
+    """Terminate the worker's ipmitool shells (IPMI_SHELL_MODE) and remove its password files"""
+    from services.ipmitool_shell import close_all_pools
+    from services.ipmi_service import remove_password_files
+    close_all_pools()
+    remove_password_files()
+
+def child_exit(server, worker):
+    """Clean up after a worker however it died, even SIGKILL
+
+    Removes the ipmitool password files it left behind and drops its live
+    gauges from the shared Prometheus directory.
+    """
+    from services.ipmi_service import remove_password_files
+    remove_password_files(worker.pid)
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
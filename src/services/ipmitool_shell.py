@@ -0,0 +1,204 @@
+import atexit
+import logging
+import os
+import selectors
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROMPT = b'ipmitool> '
+
+# Shell mode has no exit status, so failures are recognised by ipmitool's messages
+_ERROR_PREFIXES = ('error', 'unable to', 'invalid', 'failed')
+
+# Seconds to stop trying to spawn shells for a BMC after a spawn fails
+SPAWN_BACKOFF = 60
+
+class IpmitoolShell:
+    """A single long-lived `ipmitool shell` process
+
+    The RMCP+ session is set up once and reused for every command written
+    to the shell, instead of paying fork/exec and a login per command.
+    """
+
+    def __init__(self, base_cmd: Sequence[str], timeout: int = 30):
+        self._proc = subprocess.Popen(
+            list(base_cmd) + ['shell'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0
+        )
+        # epoll/poll rather than select(), which fails on fds >= 1024
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._proc.stdout, selectors.EVENT_READ)
+        try:
+            # Handshake: wait for the first prompt
+            self._read_until_prompt(timeout)
+        except Exception:
+            self.close()
+            raise
+
+    def execute(self, command: str, timeout: int = 30) -> Tuple[bool, str]:
+        """Run one command; returns (success, output)"""
+        self._proc.stdin.write(command.encode() + b'\n')
+        self._proc.stdin.flush()
+        output = self._read_until_prompt(timeout).decode(errors='replace').strip()
+
+        # Drop the echoed command line if the shell echoes its input
+        if output.startswith(command):
+            output = output[len(command):].lstrip('\r\n')
+
+        success = not any(line.lower().startswith(_ERROR_PREFIXES) for line in output.splitlines())
+        return success, output
+
+    def _read_until_prompt(self, timeout: int) -> bytes:
+        fd = self._proc.stdout.fileno()
+        buf = bytearray()
+        deadline = time.monotonic() + timeout
+        while not buf.endswith(PROMPT):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(self._proc.args, timeout)
+            if not self._selector.select(remaining):
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise BrokenPipeError('ipmitool shell exited')
+            buf += chunk
+        return bytes(buf[:-len(PROMPT)])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def close(self):
+        """Terminate the shell process"""
+        self._selector.close()
+        if self._proc.poll() is None:
+            try:
+                self._proc.stdin.write(b'exit\n')
+                self._proc.stdin.flush()
+                self._proc.wait(timeout=2)
+            except Exception:
+                self._proc.kill()
+                self._proc.wait()
+
+class IpmitoolShellPool:
+    """Bounded pool of `ipmitool shell` processes for one BMC"""
+
+    def __init__(self, name: str, base_cmd: Sequence[str], min_size: int = 0,
+                 max_size: int = 2, timeout: int = 30):
+        self.name = name
+        self.base_cmd = tuple(base_cmd)
+        self.timeout = timeout
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._retry_at = 0.0
+        self._closed = False
+        for _ in range(min_size):
+            self._idle.append(IpmitoolShell(self.base_cmd, timeout))
+
+    def execute(self, command: str, timeout: int = 30) -> Tuple[bool, str]:
+        """Run a command on an idle shell, spawning one if needed"""
+        return self.execute_many([command], timeout)[0]
+
+    def execute_many(self, commands: Sequence[str], timeout: int = 30) -> List[Tuple[bool, str]]:
+        """Run several commands back to back on one shell
+
+        Raises ConnectionError if no shell frees up within timeout, so the
+        caller can fall back to a one-off ipmitool process.
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise ConnectionError(f'all ipmitool shells for {self.name} are busy')
+        try:
+            # A shell that died while idle (e.g. BMC session expiry) gets one respawn
+            for attempt in range(2):
+                shell = self._acquire()
+                try:
+                    results = [shell.execute(command, timeout) for command in commands]
+                except BrokenPipeError:
+                    shell.close()
+                    if attempt:
+                        raise
+                    logger.info("ipmitool shell for %s exited, respawning", self.name)
+                    continue
+                except subprocess.TimeoutExpired:
+                    shell.close()
+                    raise
+                except Exception as e:
+                    # Any other I/O failure is a shell fault; ConnectionError
+                    # sends the caller to a one-off process instead
+                    shell.close()
+                    raise ConnectionError(f'ipmitool shell for {self.name} failed: {e}') from e
+                self._release(shell)
+                return results
+        finally:
+            self._slots.release()
+
+    def _acquire(self) -> IpmitoolShell:
+        with self._lock:
+            if self._closed:
+                raise ConnectionError(f'ipmitool shell pool for {self.name} is closed')
+            while self._idle:
+                shell = self._idle.popleft()
+                if shell.alive:
+                    return shell
+        # After a failed spawn, callers fall straight back to one-off processes
+        # for a while instead of paying for another failed shell start each time
+        if time.monotonic() < self._retry_at:
+            raise ConnectionError(f'ipmitool shell for {self.name} unavailable')
+        try:
+            return IpmitoolShell(self.base_cmd, self.timeout)
+        except subprocess.TimeoutExpired:
+            raise
+        except Exception as e:
+            self._retry_at = time.monotonic() + SPAWN_BACKOFF
+            raise ConnectionError(f'cannot start ipmitool shell for {self.name}: {e}') from e
+
+    def _release(self, shell: IpmitoolShell):
+        with self._lock:
+            if not self._closed:
+                self._idle.append(shell)
+                return
+        # Checked out while the pool was closed
+        shell.close()
+
+    def close(self):
+        """Terminate all idle shells; shells still in use are terminated when released"""
+        with self._lock:
+            self._closed = True
+            shells, self._idle = list(self._idle), deque()
+        for shell in shells:
+            shell.close()
+
+_pools: Dict[str, IpmitoolShellPool] = {}
+_pools_lock = threading.Lock()
+
+def get_shell_pool(key: str, base_cmd: Sequence[str]) -> IpmitoolShellPool:
+    """Get the process-wide shell pool for a server, creating it on first use"""
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = IpmitoolShellPool(key, base_cmd)
+        return pool
+
+@atexit.register
+def close_all_pools():
+    """Terminate every shell process; run at interpreter exit and by gunicorn's worker_exit"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,87 @@
+import itertools
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+try:
+    from pyghmi.ipmi import command as pyghmi_command
+except ImportError:  # optional dependency
+    pyghmi_command = None
+
+logger = logging.getLogger(__name__)
+
+AVAILABLE = pyghmi_command is not None
+
+# ipmitool's wording for each power action, so 'output' reads the same on both backends
+_POWER_OUTPUT = {
+    'on': 'Chassis Power Control: Up/On',
+    'off': 'Chassis Power Control: Down/Off',
+    'shutdown': 'Chassis Power Control: Soft',
+    'reset': 'Chassis Power Control: Reset'
+}
+
+class NativeSession:
+    """A pyghmi RMCP+ session to one BMC, opened on first use
+
+    Replaces an ipmitool process per call with a UDP session that stays
+    logged in across calls. Calls are serialized per BMC.
+    """
+
+    def __init__(self, hostname: str, username: str, password: str):
+        self.hostname = hostname
+        self._credentials = (username, password)
+        self._command = None
+        self._lock = threading.Lock()
+
+    def _session(self):
+        if self._command is None:
+            username, password = self._credentials
+            self._command = pyghmi_command.Command(bmc=self.hostname, userid=username, password=password)
+        return self._command
+
+    def reset(self):
+        """Forget the session so the next call logs in again"""
+        with self._lock:
+            self._command = None
+
+    def set_power(self, state: str) -> str:
+        """Request a power action; returns ipmitool-style output"""
+        with self._lock:
+            self._session().set_power(state)
+        return _POWER_OUTPUT[state]
+
+    def get_power(self) -> str:
+        """Current power state, 'on' or 'off'"""
+        with self._lock:
+            return self._session().get_power()['powerstate']
+
+    def get_sensors(self) -> List[Dict[str, str]]:
+        """Sensor readings in the same shape as parse_sensor_line"""
+        with self._lock:
+            readings = list(self._session().get_sensor_data())
+        return [
+            {
+                'name': reading.name,
+                'value': 'na' if reading.value is None else str(reading.value),
+                'unit': reading.units or '',
+                'status': 'ok' if not reading.health else (', '.join(reading.states) or 'ns'),
+                'lower_nr': '', 'lower_cr': '', 'lower_nc': '',
+                'upper_nc': '', 'upper_cr': '', 'upper_nr': ''
+            }
+            for reading in readings
+        ]
+
+    def get_events(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The first limit SEL entries in the same shape as IPMIService._parse_sel_line"""
+        with self._lock:
+            entries = list(itertools.islice(self._session().get_event_log(), limit))
+        return [
+            {
+                'id': str(index),
+                'timestamp': str(entry.get('timestamp', '')),
+                'sensor': entry.get('component', ''),
+                'event': entry.get('event', ''),
+                'value': 'Deasserted' if entry.get('deassertion') else 'Asserted'
+            }
+            for index, entry in enumerate(entries, 1)
+        ]
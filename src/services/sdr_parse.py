@@ -0,0 +1,22 @@
+from typing import Dict, Optional
+
+# Column order of `ipmitool sensor` output
+SENSOR_FIELDS = (
+    'name', 'value', 'unit', 'status',
+    'lower_nr', 'lower_cr', 'lower_nc',
+    'upper_nc', 'upper_cr', 'upper_nr'
+)
+_PADDING = ('',) * len(SENSOR_FIELDS)
+
+def parse_sensor_line(line: str) -> Optional[Dict[str, str]]:
+    """Parse one `ipmitool sensor` row, or return None if it is not a sensor row"""
+    if '|' not in line:
+        return None
+    # maxsplit stops at the known columns; anything past them is dropped by zip
+    parts = [part.strip() for part in line.split('|', len(SENSOR_FIELDS))]
+    if len(parts) < 3:
+        return None
+    # Short rows are padded with ''
+    if len(parts) < len(SENSOR_FIELDS):
+        parts += _PADDING[len(parts):]
+    return dict(zip(SENSOR_FIELDS, parts))
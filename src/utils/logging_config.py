@@ -0,0 +1,74 @@
+import atexit
+import copy
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
+
+class OrjsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON"""
+
+    def format(self, record):
+        entry = {
+            't': record.created,
+            'lvl': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+class _QueueHandler(QueueHandler):
+    """Enqueue records with exc_info intact so OrjsonFormatter can emit 'exc'"""
+
+    def prepare(self, record):
+        # The stock prepare() folds the traceback into msg and drops exc_info;
+        # the queue is in-process, so nothing needs to be pickleable
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+class _QueueListener(QueueListener):
+    """QueueListener whose stop() is safe to call more than once"""
+
+    def stop(self):
+        if self._thread is not None:
+            super().stop()
+
+_listener = None
+
+def configure_logging(level=logging.INFO, debug=False):
+    """Route all logging through a queue drained by a background thread
+
+    Request threads still interpolate msg % args before enqueueing; the
+    traceback, the JSON encoding and the write to stderr happen on the
+    listener thread. Calling this again replaces the previous listener.
+    """
+    global _listener
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(OrjsonFormatter())
+
+    listener = _QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.handlers[:] = [_QueueHandler(log_queue)]
+    root.setLevel(level)
+
+    # Drain and retire the old listener only once nothing enqueues to it
+    if _listener is not None:
+        _listener.stop()
+        atexit.unregister(_listener.stop)
+    _listener = listener
+
+    # Werkzeug's per-request access log is only useful with the dev server
+    if not debug:
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+    return listener
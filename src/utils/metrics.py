@@ -0,0 +1,43 @@
+from functools import wraps
+from flask import g, request
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Histogram, generate_latest
+from prometheus_client import REGISTRY, multiprocess
+import os
+import time
+
+REQUEST_LATENCY = Histogram(
+    'ipmi_request_seconds',
+    'IPMI API request latency',
+    ['endpoint', 'server_id', 'status']
+)
+
+def measure(f):
+    """Decorator recording handler latency by endpoint, server and HTTP status
+
+    Views set g.metrics_server once the target server is known; handlers
+    that act on every server are labelled 'all'.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        start = time.perf_counter()
+        response = f(*args, **kwargs)
+        REQUEST_LATENCY.labels(
+            request.endpoint,
+            g.get('metrics_server', 'all'),
+            response.status_code
+        ).observe(time.perf_counter() - start)
+        return response
+    return decorated_function
+
+def render_metrics():
+    """Exposition body and content type for /metrics
+
+    Under gunicorn with several workers, set PROMETHEUS_MULTIPROC_DIR so
+    the samples of all worker processes are aggregated.
+    """
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
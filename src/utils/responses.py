@@ -0,0 +1,88 @@
+from flask import Response, request
+from flask.json.provider import JSONProvider
+from itertools import islice
+import hashlib
+import orjson
+
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+
+class OrjsonResponse(Response):
+    """Response class that defaults to a JSON mimetype"""
+    default_mimetype = 'application/json'
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson
+
+    jsonify() and dict/list return values are encoded straight to bytes
+    and handed to the response without a str round-trip.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=_DUMPS_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=_DUMPS_OPTIONS),
+                                        mimetype='application/json')
+
+def encode_json(payload):
+    """Serialize payload to response body bytes"""
+    return orjson.dumps(payload, option=_DUMPS_OPTIONS)
+
+def ojsonify(payload, status=200, headers=None):
+    """Serialize payload with orjson into a JSON response"""
+    return OrjsonResponse(encode_json(payload), status, headers)
+
+def body_etag(body):
+    """Strong ETag (unquoted) for a serialized response body"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+def conditional_response(body, etag=None, headers=None):
+    """200 response carrying an ETag, or 304 if the client already has this body"""
+    if etag is None:
+        etag = body_etag(body)
+    if request.if_none_match.contains(etag):
+        response = OrjsonResponse(status=304, headers=headers)
+    else:
+        response = OrjsonResponse(body, 200, headers)
+    response.set_etag(etag)
+    return response
+
+# Elements encoded per chunk when streaming a large list or dict
+_STREAM_BATCH = 100
+
+def _members(payload):
+    """Encode a dict as JSON object members, without the surrounding braces"""
+    return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)[1:-1]
+
+def _generate_json(head, key, items, tail):
+    prefix = _members(head)
+    yield b'{' + prefix + (b',' if prefix else b'') + orjson.dumps(key) + b':'
+    if isinstance(items, dict):
+        opening, closing = b'{', b'}'
+        encoded = (orjson.dumps(k) + b':' + orjson.dumps(v) for k, v in items.items())
+    else:
+        opening, closing = b'[', b']'
+        encoded = map(orjson.dumps, items)
+    separator = opening
+    while True:
+        batch = list(islice(encoded, _STREAM_BATCH))
+        if not batch:
+            break
+        yield separator + b','.join(batch)
+        separator = b','
+    if separator == opening:
+        yield opening
+    suffix = _members(tail)
+    yield closing + (b',' + suffix if suffix else b'') + b'}\n'
+
+def stream_json(head, key, items, tail=None, status=200):
+    """Stream a JSON object whose `key` member holds a large list or dict
+
+    Fields in head and tail are written before and after it, so the full
+    body is never assembled in memory.
+    """
+    return OrjsonResponse(_generate_json(head, key, items, tail or {}), status)
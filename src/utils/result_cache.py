@@ -0,0 +1,47 @@
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+from utils.single_flight import single_flight
+import threading
+
+# Seconds each read result stays fresh; also sent as Cache-Control max-age
+CACHE_TTLS = {
+    'power_status': 2,
+    'system_info': 15,
+    'sensor_readings': 5,
+    'sel_info': 10
+}
+
+_caches = {name: TTLCache(maxsize=256, ttl=ttl) for name, ttl in CACHE_TTLS.items()}
+_headers = {name: {'Cache-Control': f'max-age={ttl}'} for name, ttl in CACHE_TTLS.items()}
+_lock = threading.Lock()
+
+def cache_headers(name):
+    """Cache-Control header mirroring the TTL of a cached endpoint"""
+    return _headers[name]
+
+def cached_call(name, server_id, func, *args, **kwargs):
+    """Return a fresh cached result for (server_id, args) or call func
+
+    Concurrent misses for the same key share one call. Only successful
+    results are stored, so failures are retried on the next request.
+    """
+    cache = _caches[name]
+    key = hashkey(server_id, *args, **kwargs)
+    with _lock:
+        result = cache.get(key)
+    if result is not None:
+        return result
+    result = single_flight((name, key), func, *args, **kwargs)
+    if result.get('success'):
+        with _lock:
+            cache[key] = result
+    return result
+
+def invalidate(name, server_id=None):
+    """Drop cached results for one server, or for all servers if server_id is None"""
+    cache = _caches[name]
+    with _lock:
+        if server_id is None:
+            cache.clear()
+        else:
+            cache.pop(hashkey(server_id), None)
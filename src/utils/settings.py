@@ -0,0 +1,20 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Process settings, read from the environment once at import"""
+    port: int
+    debug: bool
+    static_cache_dir: Optional[str]
+    ipmi_shell: bool
+    ipmi_native: bool
+
+SETTINGS = Settings(
+    port=int(os.environ.get('PORT', 5000)),
+    debug=os.environ.get('DEBUG', 'False').lower() == 'true',
+    static_cache_dir=os.environ.get('STATIC_CACHE_DIR') or None,
+    ipmi_shell=os.environ.get('IPMI_SHELL_MODE', 'False').lower() == 'true',
+    ipmi_native=os.environ.get('IPMI_NATIVE', 'False').lower() == 'true'
+)
@@ -0,0 +1,31 @@
+from concurrent.futures import Future
+import threading
+
+_inflight = {}
+_lock = threading.Lock()
+
+def single_flight(key, func, *args, **kwargs):
+    """Run func once per key at a time; concurrent callers share its result
+
+    The first caller for a key executes func, later callers block on the
+    same Future until it finishes. Exceptions propagate to every caller.
+    """
+    with _lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result()
+
+    try:
+        result = func(*args, **kwargs)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _lock:
+            del _inflight[key]
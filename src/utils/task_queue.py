@@ -0,0 +1,27 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+import threading
+import uuid
+
+# Finished tasks are kept for polling until this many newer tasks exist
+MAX_TASKS = 256
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='bulk-task')
+_tasks: 'OrderedDict[str, Future]' = OrderedDict()
+_lock = threading.Lock()
+
+def submit_task(func, *args, **kwargs) -> str:
+    """Run func in the background and return an ID for polling its result"""
+    task_id = uuid.uuid4().hex
+    future = _executor.submit(func, *args, **kwargs)
+    with _lock:
+        _tasks[task_id] = future
+        while len(_tasks) > MAX_TASKS:
+            _tasks.popitem(last=False)
+    return task_id
+
+def get_task(task_id: str) -> Optional[Future]:
+    """Future for a submitted task, or None if unknown or already evicted"""
+    with _lock:
+        return _tasks.get(task_id)
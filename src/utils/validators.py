@@ -7,33 +7,41 @@ logger = logging.getLogger(__name__)
 def validate_request(required_fields=None):
     """Decorator to validate request data"""
     def decorator(f):
+        if not required_fields:
+            return f
+        required = frozenset(required_fields)
+        
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            if required_fields:
-                if not request.is_json:
-                    return jsonify({'error': 'Request must be JSON'}), 400
-                
-                data = request.get_json()
-                missing_fields = []
-                
-                for field in required_fields:
-                    if field not in data:
-                        missing_fields.append(field)
-                
-                if missing_fields:
-                    return jsonify({
-                        'error': 'Missing required fields',
-                        'missing_fields': missing_fields
-                    }), 400
+            # None for a non-JSON content type or an unparsable body
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict):
+                return jsonify({'error': 'Request must be JSON'}), 400
+            
+            missing = required.difference(data)
+            if missing:
+                return jsonify({
+                    'error': 'Missing required fields',
+                    'missing_fields': [field for field in required_fields if field in missing]
+                }), 400
             
             return f(*args, **kwargs)
         return decorated_function
     return decorator
 
+_POWER_ACTIONS = frozenset(('on', 'off', 'reset', 'soft'))
+
 def validate_power_action(action):
     """Validate power action parameters"""
-    valid_actions = ['on', 'off', 'reset', 'soft']
-    return action.lower() in valid_actions
+    return action.lower() in _POWER_ACTIONS
+
+# Boot devices accepted by `ipmitool chassis bootdev`, in display order
+VALID_BOOT_DEVICES = ('pxe', 'disk', 'cdrom', 'bios', 'floppy', 'safe')
+_BOOT_DEVICE_SET = frozenset(VALID_BOOT_DEVICES)
+
+def validate_boot_device(device):
+    """Validate boot device name (case-insensitive)"""
+    return isinstance(device, str) and device.lower() in _BOOT_DEVICE_SET
 
 def validate_ipmi_hostname(hostname):
     """Basic validation for IPMI hostname/IP"""